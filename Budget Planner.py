@@ -1,25 +1,48 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import messagebox, simpledialog, ttk
 import sqlite3
-from os.path import exists
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.cm as cm
-import numpy as np
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors as reportlab_colors
-from reportlab.platypus import Spacer
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-from reportlab.platypus.flowables import Image as platypusImage
+import threading
 import io
+# matplotlib, numpy and reportlab are imported inside category_colors, visualise_data
+# and _write_receipt so that starting the app and editing expenses never pay for them
+
+DB_FILE = "expense.db"
+
+# how often buffered expenses are written to the database (milliseconds)
+FLUSH_INTERVAL_MS = 5000
+
+# expense rows fetched per round-trip while building the receipt table
+RECEIPT_CHUNK_ROWS = 500
+
+# how often the UI checks whether a receipt being built in the background is done
+RECEIPT_POLL_MS = 100
+
+
+def _connect(db_file=DB_FILE):
+    # WAL journal + relaxed fsync, temp tables in memory and a ~64MB page cache
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    return conn
+
 
 class ExpenseTracker(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Expense Tracker")
 
-        self.db_file = "expense.db"
+        self.db_file = DB_FILE
+        # expenses added in the UI but not yet written to the database; until then
+        # they are keyed on a temporary negative id, replaced by SQLite's id on flush
+        self._pending = []
+        self._next_temp_id = -1
+        # one connection for the lifetime of the app keeps SQLite's page cache warm
+        self.conn = _connect(self.db_file)
         self.create_database()
+        # viridis colour arrays by bar count, shared by the chart and the receipt
+        self._color_cache = {}
 
         # create GUI widgets first so update_expenses() can safely operate
         self.create_widgets()
@@ -28,43 +51,145 @@ class ExpenseTracker(tk.Tk):
         # then load existing expenses and populate treeview
         self.load_expenses()
 
+        # write buffered expenses periodically and before the window closes
+        self.after(FLUSH_INTERVAL_MS, self.autoflush)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def create_database(self):
-        # create database + table if missing
-        if not exists(self.db_file):
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
-            # correct CREATE TABLE syntax
-            c.execute("""CREATE TABLE expenses (
-                           date TEXT,
-                           category TEXT,
-                           amount REAL
-                         )""")
-            conn.commit()
-            conn.close()
+        # create table if missing (the connection has already created the file)
+        c = self.conn.cursor()
+        c.execute("""CREATE TABLE IF NOT EXISTS expenses (
+                       id INTEGER PRIMARY KEY AUTOINCREMENT,
+                       date TEXT,
+                       category TEXT,
+                       amount REAL
+                     )""")
+        self.migrate_expense_ids()
+        # amounts stored as text by older versions are converted once here, so
+        # reads can trust the REAL column instead of calling float() per row
+        c.execute("UPDATE expenses SET amount = CAST(amount AS REAL) WHERE typeof(amount) NOT IN ('real', 'null')")
+        # update/delete are keyed on id now, so the (date, category, amount) index is unused
+        c.execute("DROP INDEX IF EXISTS idx_expenses_dca")
+        # category_totals groups by category
+        c.execute("CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category)")
+
+    def migrate_expense_ids(self):
+        # older databases have no id column; rebuild the table keeping each row's rowid as its id
+        c = self.conn.cursor()
+        columns = [row[1] for row in c.execute("PRAGMA table_info(expenses)")]
+        if "id" in columns:
+            return
+        c.execute("BEGIN")
+        c.execute("ALTER TABLE expenses RENAME TO expenses_old")
+        c.execute("""CREATE TABLE expenses (
+                       id INTEGER PRIMARY KEY AUTOINCREMENT,
+                       date TEXT,
+                       category TEXT,
+                       amount REAL
+                     )""")
+        c.execute("""INSERT INTO expenses (id, date, category, amount)
+                     SELECT rowid, date, category, amount FROM expenses_old""")
+        c.execute("DROP TABLE expenses_old")
+        self.conn.commit()
 
     def load_expenses(self):
-        # load expenses from DB into self.expenses list
-        self.expenses = []
-        if exists(self.db_file):
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
-            c.execute("SELECT date, category, amount FROM expenses")
-            rows = c.fetchall()
-            conn.close()
-
-            # ensure amounts are floats
-            self.expenses = [(date, category, float(amount)) for date, category, amount in rows]
+        # load expenses from DB into self.expenses, keyed by id
+        c = self.conn.cursor()
+        c.execute("SELECT id, date, category, amount FROM expenses")
+        rows = c.fetchall()
+
+        # amounts are already floats (see create_database)
+        self.expenses = {row[0]: row[1:] for row in rows}
 
         # populate treeview from loaded list
         self.update_expenses()
 
-    def save_expenses(self, date, category, amount):
-        conn = sqlite3.connect(self.db_file)
+    def save_expenses(self, rows):
+        # insert a batch of (date, category, amount) rows in a single transaction and
+        # return the ids SQLite assigned them, in order
+        rows = list(rows)
+        if not rows:
+            return []
+        c = self.conn.cursor()
+        # IMMEDIATE takes the write lock up front, so no other connection can insert
+        # in between and the AUTOINCREMENT ids of this batch are consecutive
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            c.executemany('INSERT INTO expenses (date, category, amount) VALUES (?,?,?)', rows)
+            last_id = c.execute("SELECT last_insert_rowid()").fetchone()[0]
+        except BaseException:
+            # leave the connection usable for the next write
+            c.execute("ROLLBACK")
+            raise
+        self.conn.commit()
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def category_totals(self):
+        # (category, total) pairs summed by SQLite; buffered rows are written first so they
+        # count. Returns None if they could not be written (the user has been told why)
+        if not self.flush_pending():
+            return None
+        c = self.conn.cursor()
+        c.execute("SELECT category, SUM(amount) FROM expenses GROUP BY category")
+        return c.fetchall()
+
+    def iter_expense_rows(self, conn, size=RECEIPT_CHUNK_ROWS):
+        # yield receipt table rows from the database in chunks of `size`
         c = conn.cursor()
-        c.execute('INSERT INTO expenses (date, category, amount) VALUES (?,?,?)',
-                  (date, category, amount))
-        conn.commit()
-        conn.close()
+        c.execute("SELECT date, category, amount FROM expenses ORDER BY id")
+        while True:
+            rows = c.fetchmany(size)
+            if not rows:
+                break
+            yield [[date, category, f"{amount:.2f}"] for date, category, amount in rows]
+
+    def flush_pending(self, report=True):
+        # write any buffered expenses to the database; returns False if that failed,
+        # in which case the rows stay buffered for the next attempt
+        if not self._pending:
+            return True
+        try:
+            ids = self.save_expenses(row[1:] for row in self._pending)
+        except sqlite3.Error as e:
+            if report:
+                messagebox.showerror("Error", f"Could not save {len(self._pending)} expense(s): {e}")
+            return False
+        for (temp_id, *_), eid in zip(self._pending, ids):
+            self.rekey_expense(temp_id, eid)
+        self._pending = []
+        return True
+
+    def rekey_expense(self, temp_id, eid):
+        # move a flushed row from its temporary id to its real one, keeping its
+        # position and selection in the tree
+        date, category, amount = self.expenses[eid] = self.expenses.pop(temp_id)
+        old = str(temp_id)
+        index = self.tree_expenses.index(old)
+        selected = old in self.tree_expenses.selection()
+        self.tree_expenses.delete(old)
+        self.tree_expenses.insert("", index, iid=str(eid), values=(date, category, f"{amount:.2f}"))
+        if selected:
+            self.tree_expenses.selection_add(str(eid))
+
+    def autoflush(self):
+        # silent: a failed background write is retried on the next tick, and reported
+        # by the next save the user asks for
+        self.flush_pending(report=False)
+        self.after(FLUSH_INTERVAL_MS, self.autoflush)
+
+    def on_close(self):
+        # make sure nothing in the buffer is lost when the window closes; if the write
+        # fails, stay open unless the user chooses to discard the unsaved rows
+        if not self.flush_pending(report=False):
+            discard = messagebox.askyesno(
+                "Discard unsaved expenses?",
+                f"{len(self._pending)} expense(s) could not be saved. Close anyway and discard them?\n\n"
+                "Choose No to keep the window open and retry with Save.",
+                icon=messagebox.WARNING)
+            if not discard:
+                return
+        self.conn.close()
+        self.destroy()
 
     def update_selected_expense(self):
         # update the currently selected expense in the DB with entry values
@@ -79,8 +204,6 @@ class ExpenseTracker(tk.Tk):
             messagebox.showwarning("Warning", "Please select a valid expense.")
             return
 
-        orig_date, orig_category, orig_amount = orig_values
-
         new_date = self.entry_date.get().strip()
         new_category = self.entry_category.get().strip()
         new_amount = self.entry_amount.get().strip()
@@ -95,18 +218,25 @@ class ExpenseTracker(tk.Tk):
             messagebox.showerror("Error", "Amount must be a number.")
             return
 
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        # the selected row may still be buffered; write it before updating (which
+        # gives it its real id, so read the selection again)
+        if not self.flush_pending():
+            return
+        item = self.tree_expenses.selection()[0]
+
+        c = self.conn.cursor()
         c.execute("""
             UPDATE expenses
             SET date = ?, category = ?, amount = ?
-            WHERE date = ? AND category = ? AND amount = ?
-            """, (new_date, new_category, new_amount_f, orig_date, orig_category, float(orig_amount)))
-        conn.commit()
-        conn.close()
-
-        # refresh
-        self.load_expenses()
+            WHERE id = ?
+            """, (new_date, new_category, new_amount_f, int(item)))
+
+        # refresh just this row and adjust the total by the difference
+        eid = int(item)
+        self._total += new_amount_f - self.expenses[eid][2]
+        self.expenses[eid] = (new_date, new_category, new_amount_f)
+        self.tree_expenses.item(item, values=(new_date, new_category, f"{new_amount_f:.2f}"))
+        self.update_total_label()
         # clear entries after update
         self.entry_date.delete(0, tk.END)
         self.entry_category.delete(0, tk.END)
@@ -128,15 +258,58 @@ class ExpenseTracker(tk.Tk):
         if not confirm:
             return
 
-        date, category, amount = values
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute("DELETE FROM expenses WHERE date=? AND category=? AND amount=?", (date, category, float(amount)))
-        conn.commit()
-        conn.close()
+        # as in update_selected_expense, a buffered row only has its real id after the flush
+        if not self.flush_pending():
+            return
+        item = self.tree_expenses.selection()[0]
+        c = self.conn.cursor()
+        c.execute("DELETE FROM expenses WHERE id=?", (int(item),))
+
+        # drop just this row from the tree
+        self._total -= self.expenses.pop(int(item))[2]
+        self.tree_expenses.delete(item)
+        self.update_total_label()
+
+    def bulk_update_category(self, old, new):
+        # rename a category on every matching row in one transaction; returns False
+        # if nothing was changed (the user has been told why)
+        if not self.flush_pending():
+            return False
+        c = self.conn.cursor()
+        c.execute("BEGIN")
+        try:
+            c.execute("UPDATE expenses SET category = ? WHERE category = ?", (new, old))
+        except sqlite3.Error as e:
+            c.execute("ROLLBACK")
+            messagebox.showerror("Error", f"Could not rename category: {e}")
+            return False
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+        self.conn.commit()
+        return True
+
+    def rename_category(self):
+        selected = self.tree_expenses.selection()
+        if not selected:
+            messagebox.showwarning("Warning", "Please select an expense to rename its category.")
+            return
 
-        # refresh tree
-        self.load_expenses()
+        old = self.expenses[int(selected[0])][1]
+        new = simpledialog.askstring("Rename Category", f"Rename '{old}' on all expenses to:",
+                                     initialvalue=old, parent=self)
+        if not new or not new.strip() or new.strip() == old:
+            return
+        new = new.strip()
+
+        if not self.bulk_update_category(old, new):
+            return
+
+        # update matching rows in place
+        for eid, (date, category, amount) in self.expenses.items():
+            if category == old:
+                self.expenses[eid] = (date, new, amount)
+                self.tree_expenses.item(str(eid), values=(date, new, f"{amount:.2f}"))
 
     def edit_expense(self):
         selected = self.tree_expenses.selection()
@@ -163,6 +336,7 @@ class ExpenseTracker(tk.Tk):
         self.context_menu = tk.Menu(self, tearoff=0)
         self.context_menu.add_command(label="Delete", command=self.delete_expense)
         self.context_menu.add_command(label="Edit", command=self.edit_expense)
+        self.context_menu.add_command(label="Rename Category", command=self.rename_category)
         # bind right-click on treeview to show context menu
         self.tree_expenses.bind("<Button-3>", self.show_context_menu)
 
@@ -199,6 +373,9 @@ class ExpenseTracker(tk.Tk):
         self.button_visualise = tk.Button(self, text="Visualise Data", command=self.visualise_data)
         self.button_visualise.grid(row=6, columnspan=2, pady=10)
 
+        self.button_save = tk.Button(self, text="Save", command=self.flush_pending)
+        self.button_save.grid(row=7, columnspan=2, pady=10)
+
         self.button_receipt = tk.Button(self, text="Generate Receipt", command=self.generate_receipt)
         self.button_receipt.grid(row=8, columnspan=2, pady=10)
 
@@ -216,6 +393,12 @@ class ExpenseTracker(tk.Tk):
         self.label_total = tk.Label(self, text="Total Expenses: ₦0.00", font=("Arial", 10, "bold"))
         self.label_total.grid(row=5, columnspan=2, pady=5)
 
+        # chart figure and canvas are built on first use and then redrawn in place;
+        # _bars/_bar_cats are the drawn bar artists and the categories they belong to
+        self.fig = self.ax = self.canvas = None
+        self._bars = None
+        self._bar_cats = None
+
     def add_expense(self):
         date = self.entry_date.get().strip()
         category = self.entry_category.get().strip()
@@ -231,60 +414,88 @@ class ExpenseTracker(tk.Tk):
             messagebox.showerror("Error", "Amount must be a number.")
             return
 
-        self.save_expenses(date, category, amount)
-        self.load_expenses()
+        # buffer the row and show it straight away; it is written (and gets its real
+        # id) on the next flush
+        eid = self._next_temp_id
+        self._next_temp_id -= 1
+        self._pending.append((eid, date, category, amount))
+        self.expenses[eid] = (date, category, amount)
+        self.tree_expenses.insert("", "end", iid=str(eid), values=(date, category, f"{amount:.2f}"))
+        self._total += amount
+        self.update_total_label()
 
         # clear input fields
         self.entry_date.delete(0, tk.END)
         self.entry_category.delete(0, tk.END)
         self.entry_amount.delete(0, tk.END)
 
+    def category_colors(self, n):
+        # n evenly spaced viridis colours, computed once per n
+        colors = self._color_cache.get(n)
+        if colors is None:
+            import matplotlib.cm as cm
+            import numpy as np
+            colors = self._color_cache[n] = cm.viridis(np.linspace(0, 1, n))
+        return colors
+
     def visualise_data(self):
         # simple bar chart of total amounts per category
         if not self.expenses:
             messagebox.showinfo("No Data", "No expenses to visualise.")
             return
 
-        categories = [e[1] for e in self.expenses]
-        amounts = [e[2] for e in self.expenses]
-
-        # aggregate amounts by category
-        agg = {}
-        for cat, amt in zip(categories, amounts):
-            agg[cat] = agg.get(cat, 0) + amt
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-        cats = list(agg.keys())
-        vals = [agg[c] for c in cats]
+        if self.canvas is None:
+            self.fig, self.ax = plt.subplots()
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self)
 
-        fig, ax = plt.subplots()
-        colors = cm.viridis(np.linspace(0, 1, len(cats)))
-        ax.bar(cats, vals, color=colors)
-        ax.set_xlabel("Category")
-        ax.set_ylabel("Amount")
-        ax.set_title("Expenses by Category")
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-
-        # embed into tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self)
-        canvas_widget = canvas.get_tk_widget()
-        # place canvas to the right of the inputs (adjust column index if needed)
+        totals = self.category_totals()
+        if totals is None:
+            return
+        cats = [cat for cat, _ in totals]
+        vals = [total for _, total in totals]
+
+        ax = self.ax
+        if cats == self._bar_cats:
+            # same categories as last time: only the bar heights can have changed
+            for rect, height in zip(self._bars, vals):
+                rect.set_height(height)
+            ax.relim()
+            ax.autoscale_view()
+        else:
+            ax.clear()
+            colors = self.category_colors(len(cats))
+            self._bars = ax.bar(cats, vals, color=colors)
+            self._bar_cats = cats
+            ax.set_xlabel("Category")
+            ax.set_ylabel("Amount")
+            ax.set_title("Expenses by Category")
+            plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+            self.fig.tight_layout()
+
+        # place canvas to the right of the inputs (a no-op once it is gridded)
+        canvas_widget = self.canvas.get_tk_widget()
         canvas_widget.grid(row=0, column=2, rowspan=9, padx=10, pady=10, sticky="nsew")
-        canvas.draw()
+        self.canvas.draw_idle()
 
     def update_expenses(self):
-        # clear the treeview and repopulate from self.expenses
+        # clear the treeview and repopulate from self.expenses; only used on load,
+        # add/update/delete touch their own row
         for item in self.tree_expenses.get_children():
             self.tree_expenses.delete(item)
 
-        total = 0.0
-        for expense in self.expenses:
-            # insert as strings for consistent display
-            date, category, amount = expense
-            self.tree_expenses.insert("", "end", values=(date, category, f"{amount:.2f}"))
-            total += amount
+        self._total = 0.0
+        for eid, (date, category, amount) in self.expenses.items():
+            # insert as strings for consistent display; the row's iid is the expense id
+            self.tree_expenses.insert("", "end", iid=str(eid), values=(date, category, f"{amount:.2f}"))
+            self._total += amount
+
+        self.update_total_label()
 
-        self.label_total.config(text=f"Total Expenses: ₦{total:.2f}")
+    def update_total_label(self):
+        self.label_total.config(text=f"Total Expenses: ₦{self._total:.2f}")
 
     def generate_receipt(self):
         if not self.expenses:
@@ -292,19 +503,54 @@ class ExpenseTracker(tk.Tk):
             return
 
         receipt_filename = "expense-receipt.pdf"
-        dates = [expense[0] for expense in self.expenses]
-        categories = [expense[1] for expense in self.expenses]
-        amounts = [expense[2] for expense in self.expenses]
+        # flushes buffered rows, so the worker's own connection sees everything
+        totals = self.category_totals()
+        if totals is None:
+            return
 
-        doc = SimpleDocTemplate(receipt_filename, pagesize=letter)
-        elements = []
+        # build the PDF off the Tk thread; the worker never touches widgets, the
+        # main loop polls for its result instead
+        self.button_receipt.config(state=tk.DISABLED)
+        self._receipt_error = None
+        worker = threading.Thread(target=self._build_receipt, args=(receipt_filename, totals), daemon=True)
+        worker.start()
+        self.after(RECEIPT_POLL_MS, self._check_receipt, worker, receipt_filename)
+
+    def _check_receipt(self, worker, receipt_filename):
+        if worker.is_alive():
+            self.after(RECEIPT_POLL_MS, self._check_receipt, worker, receipt_filename)
+            return
+        self.button_receipt.config(state=tk.NORMAL)
+        if self._receipt_error is not None:
+            messagebox.showerror("Error", f"Could not generate receipt: {self._receipt_error}")
+        else:
+            messagebox.showinfo("Receipt Generated", f"Receipt saved as {receipt_filename}")
+
+    def _build_receipt(self, receipt_filename, totals):
+        # runs on a worker thread with its own connection (sqlite3 connections are per-thread)
+        try:
+            conn = _connect(self.db_file)
+            try:
+                self._write_receipt(conn, receipt_filename, totals)
+            finally:
+                conn.close()
+        except Exception as e:
+            self._receipt_error = e
+
+    def _write_receipt(self, conn, receipt_filename, totals):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib import colors as reportlab_colors
+        from reportlab.platypus import Spacer
+        from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle
+        from reportlab.platypus.flowables import Image as platypusImage
 
-        # build table data
-        data = [["Date", "Category", "Amount (₦)"]]
-        for date, category, amount in zip(dates, categories, amounts):
-            data.append([date, category, f"{amount:.2f}"])
+        elements = []
 
-        table = Table(data)
+        # one table for all rows, with the header repeated only at page breaks;
+        # rows are read in chunks but the table still holds them all until build
+        header = ["Date", "Category", "Amount (₦)"]
         style = TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), reportlab_colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), reportlab_colors.whitesmoke),
@@ -314,31 +560,39 @@ class ExpenseTracker(tk.Tk):
             ('BACKGROUND', (0, 1), (-1, -1), reportlab_colors.beige),
             ('GRID', (0, 0), (-1, -1), 1, reportlab_colors.black),
         ])
+        data = [header]
+        for chunk in self.iter_expense_rows(conn):
+            data.extend(chunk)
+        table = LongTable(data, repeatRows=1)
         table.setStyle(style)
         elements.append(table)
         elements.append(Spacer(1, 12))
 
-        # create a bar chart image to include
-        fig, ax = plt.subplots()
-        barcolors = cm.viridis(np.linspace(0, 1, len(categories)))
-        ax.bar(categories, amounts, color=barcolors)
+        # create a bar chart image to include; rendered off-screen on Agg, outside pyplot
+        # (the object-oriented Agg API is safe to use off the main thread)
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        barcolors = self.category_colors(len(totals))
+        ax.bar([cat for cat, _ in totals], [total for _, total in totals], color=barcolors)
         ax.set_xlabel("Category")
         ax.set_ylabel("Amount (₦)")
         ax.set_title("Expenses Visualisation by Category")
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+            label.set_ha("right")
+        fig.tight_layout()
 
         temp_image = io.BytesIO()
-        fig.savefig(temp_image, format='PNG')
-        plt.close(fig)
+        fig.savefig(temp_image, format='PNG', dpi=100)
         temp_image.seek(0)
 
         image = platypusImage(temp_image, width=400, height=300)
         elements.append(image)
 
+        # ReportLab keeps the document in memory and writes the file when build finishes
+        doc = SimpleDocTemplate(receipt_filename, pagesize=letter)
         doc.build(elements)
-        messagebox.showinfo("Receipt Generated", f"Receipt saved as {receipt_filename}")
-
 
 if __name__ == "__main__":
     app = ExpenseTracker()
@@ -42,10 +42,11 @@ def add_task():
 def delete_task():
     try:
         index = task_listbox.curselection()[0]
-        task_listbox.delete(index)
-        tasks.pop(index)
-    except:
+    except IndexError:
         messagebox.showerror("Error", "Select a task to delete.")
+        return
+    task_listbox.delete(index)
+    tasks.pop(index)
 
 tk.Button(todo_tab, text="Add Task", command=add_task, width=15).pack(pady=5)
 tk.Button(todo_tab, text="Delete Task", command=delete_task, width=15).pack(pady=5)
@@ -58,6 +59,8 @@ budget_tab = ttk.Frame(notebook)
 notebook.add(budget_tab, text="Budget Tracker")
 
 expenses = []
+# running sum of expenses, adjusted on add/delete instead of re-summing the list
+expenses_total = 0.0
 total_amount = tk.StringVar()
 total_amount.set("0.00")
 
@@ -76,6 +79,7 @@ expense_amount.insert(0, "Amount")
 
 # Add expense
 def add_expense():
+    global expenses_total
     name = expense_name.get().strip()
     amount = expense_amount.get().strip()
     
@@ -85,28 +89,33 @@ def add_expense():
     
     try:
         amount = float(amount)
-        expenses.append((name, amount))
-        expense_listbox.insert(tk.END, f"{name} - ₦{amount:.2f}")
-        
-        current_total = sum(x[1] for x in expenses)
-        total_amount.set(f"{current_total:.2f}")
-
-        expense_name.delete(0, tk.END)
-        expense_amount.delete(0, tk.END)
-    except:
+    except ValueError:
         messagebox.showerror("Error", "Amount must be a number!")
+        return
+
+    expenses.append((name, amount))
+    expense_listbox.insert(tk.END, f"{name} - ₦{amount:.2f}")
+    
+    expenses_total += amount
+    total_amount.set(f"{expenses_total:.2f}")
+
+    expense_name.delete(0, tk.END)
+    expense_amount.delete(0, tk.END)
 
 # Delete expense
 def delete_expense():
+    global expenses_total
     try:
         index = expense_listbox.curselection()[0]
-        expenses.pop(index)
-        expense_listbox.delete(index)
-        
-        current_total = sum(x[1] for x in expenses)
-        total_amount.set(f"{current_total:.2f}")
-    except:
+    except IndexError:
         messagebox.showerror("Error", "Select an expense to delete.")
+        return
+    _, amount = expenses.pop(index)
+    expense_listbox.delete(index)
+    
+    # reset when empty so float rounding can't leave "-0.00" behind
+    expenses_total = expenses_total - amount if expenses else 0.0
+    total_amount.set(f"{expenses_total:.2f}")
 
 tk.Button(budget_tab, text="Add Expense", command=add_expense, width=15).pack(pady=5)
 tk.Button(budget_tab, text="Delete Expense", command=delete_expense, width=15).pack(pady=5)
@@ -1,17 +1,25 @@
 # productivity_suite.py
 import sys
 import io
+import math
 import sqlite3
+import time
 import datetime
-from collections import Counter, defaultdict
+import threading
+from functools import lru_cache
+
+import numpy as np
 
 # PyQt5 core and GUI
-from PyQt5.QtCore import Qt, QTimer, QDate
+from PyQt5.QtCore import (
+    Qt, QTimer, QElapsedTimer, QDate, QEvent, QObject, QRunnable, QThreadPool, pyqtSignal,
+    QAbstractTableModel, QModelIndex
+)
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton, QLabel, QLineEdit, 
-    QVBoxLayout, QHBoxLayout, QFormLayout, QStackedWidget, QTableWidget, 
-    QTableWidgetItem, QListWidget, QListWidgetItem, QComboBox, QSpinBox,
+    QVBoxLayout, QHBoxLayout, QFormLayout, QStackedWidget, QTableView, 
+    QAbstractItemView, QListWidget, QListWidgetItem, QComboBox, QSpinBox,
     QFrame, QSplitter, QFileDialog, QSizePolicy, QMessageBox, QTabWidget, QDateEdit,
     QInputDialog, QHeaderView
 )
@@ -20,72 +28,376 @@ from PyQt5.QtWidgets import (
 import matplotlib
 matplotlib.use("Qt5Agg")
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+# Figures are built directly rather than through pyplot, so none of them are
+# registered with (or leak into) pyplot's global figure manager
+from matplotlib.figure import Figure
+
+# ReportLab for PDF export is imported in PdfExportTask.build, the only place it is used
+
+# ------------------------
+# Fonts
+# ------------------------
+# Widgets share one QFont per (family, size, weight) instead of resolving a new
+# one for every label. Built on first use, since a QFont needs the application.
+@lru_cache(maxsize=None)
+def _font(family, size, weight=QFont.Normal):
+    return QFont(family, size, weight)
 
-# ReportLab for PDF export
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors as reportlab_colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Spacer, Image as PlatypusImage
+# ------------------------
+# Stylesheet
+# ------------------------
+# One stylesheet for the whole app, applied once on the QApplication so Qt
+# parses it a single time. Rules are scoped to the widget they belong to so
+# they neither leak into standalone dialogs nor into each other; the page
+# rules come after the MainWindow ones so they win on equal specificity.
+APP_QSS = """
+    MainWindow {
+        background-color: #121212;
+    }
+    MainWindow QLabel {
+        color: #e9e9e9;
+    }
+    MainWindow QPushButton {
+        background-color: #1565C0;
+        color: white;
+        border-radius: 4px;
+        padding: 5px;
+    }
+    MainWindow QPushButton:hover {
+        background-color: #1976D2;
+    }
+    MainWindow QFrame {
+        background-color: #1e1e1e;
+    }
+
+    ToDoWidget, ToDoWidget QWidget {
+        background-color: #121212;
+        color: #e9e9e9;
+    }
+    ToDoWidget QLineEdit, ToDoWidget QPushButton, ToDoWidget QListWidget {
+        font-size: 14px;
+    }
+    ToDoWidget QListWidget::item:selected {
+        background-color: #1565C0;
+        color: #ffffff;
+    }
+    ToDoWidget QPushButton {
+        background-color: #1E1E1E;
+        color: #FFFFFF;
+        border: 1px solid #333;
+        padding: 6px 12px;
+        border-radius: 4px;
+    }
+    ToDoWidget QPushButton:hover {
+        background-color: #1565C0;
+    }
+    ToDoWidget QLineEdit {
+        background-color: #1E1E1E;
+        border: 1px solid #333;
+        color: #ffffff;
+        padding: 6px;
+    }
+
+    PomodoroWidget, PomodoroWidget QWidget {
+        background-color: #121212;
+        color: #e9e9e9;
+    }
+    PomodoroWidget QLabel {
+        color: #ffffff;
+    }
+    PomodoroWidget QPushButton {
+        background-color: #1E1E1E;
+        color: #FFFFFF;
+        border: 1px solid #333;
+        padding: 6px 12px;
+        border-radius: 4px;
+    }
+    PomodoroWidget QPushButton:disabled {
+        background-color: #333;
+        color: #888;
+    }
+    PomodoroWidget QPushButton:hover:!disabled {
+        background-color: #1565C0;
+    }
+    PomodoroWidget QSpinBox {
+        background-color: #1E1E1E;
+        color: #ffffff;
+        border: 1px solid #333;
+        padding: 2px 4px;
+    }
+
+    AnalyticsWidget, AnalyticsWidget QWidget {
+        background-color: #121212;
+        color: #e9e9e9;
+    }
+    AnalyticsWidget QLabel {
+        color: #ffffff;
+    }
+
+    BudgetWidget, BudgetWidget QWidget {
+        background-color: #121212;
+        color: #e9e9e9;
+    }
+    BudgetWidget QLabel {
+        color: #ffffff;
+    }
+    BudgetWidget QLineEdit, BudgetWidget QDateEdit, BudgetWidget QTableView {
+        background-color: #1e1e1e;
+        color: #ffffff;
+        border: 1px solid #333333;
+    }
+    BudgetWidget QPushButton {
+        background-color: #1565C0;
+        color: white;
+        border-radius: 4px;
+        padding: 6px;
+    }
+    BudgetWidget QPushButton:hover {
+        background-color: #1976D2;
+    }
+    BudgetWidget QTableView {
+        alternate-background-color: #181818;
+        gridline-color: #333;
+    }
+    BudgetWidget QTableView::item {
+        padding: 6px;
+    }
+    BudgetWidget QHeaderView::section:horizontal {
+        background-color: #1e1e1e;
+        color: white;
+        padding: 6px;
+        border: 1px solid #333;
+        font-weight: bold;
+    }
+
+    /* single widgets, picked out by objectName; the id outranks the page rules */
+    ToDoWidget QLabel#todoHint {
+        color: gray;
+        font-size: 11px;
+    }
+    AnalyticsWidget #chartCanvas {
+        background-color: transparent;
+    }
+    MainWindow QFrame#dashboardDivider {
+        color: #555555;
+    }
+"""
 
 # ------------------------
 # Database setup
 DB_FILE = "productivity.db"
+# expense rows fetched per round-trip while writing the receipt PDF
+PDF_CHUNK_ROWS = 1000
+# receipt chart size in PDF points; rendered at 72 DPI it is one pixel per point
+PDF_CHART_SIZE = (400, 200)
+PDF_CHART_DPI = 72
 
 # ------------------------
 # Database helpers
 # ------------------------
-def init_db():
-    """Initialize database tables if they don't exist."""
-    with sqlite3.connect(DB_FILE) as conn:
-        c = conn.cursor()
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                notes TEXT,
-                created_at TEXT DEFAULT (datetime('now')),
-                completed INTEGER DEFAULT 0,
-                completed_at TEXT
-            )
-        """)
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS pomodoros (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER,
-                duration INTEGER,
-                timestamp TEXT DEFAULT (datetime('now'))
-            )
-        """)
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT DEFAULT (date('now')),
-                category TEXT,
-                description TEXT,
-                amount REAL
-            )
+def _connect():
+    """
+    Open a connection to DB_FILE in autocommit mode with WAL journaling,
+    NORMAL sync, in-memory temp storage and a ~64MB page cache. Up to 256
+    prepared statements are kept, so the refresh queries are parsed once.
+    """
+    conn = sqlite3.connect(DB_FILE, isolation_level=None, check_same_thread=False,
+                           cached_statements=256)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    return conn
+
+class DB:
+    """
+    Long-lived connection shared by the whole app, so SQLite's page cache
+    survives between queries. The lock serialises access across threads.
+    """
+    def __init__(self):
+        self.conn = _connect()
+        self.lock = threading.Lock()
+
+    def execute(self, query, params=()):
+        """
+        Execute INSERT/UPDATE/DELETE queries.
+        Returns the last inserted row id if available.
+        """
+        with self.lock:
+            return self.conn.execute(query, params).lastrowid
+
+    def executemany(self, query, seq_of_params):
+        """
+        Execute one INSERT/UPDATE/DELETE for every parameter tuple inside a
+        single transaction, so a bulk write commits (and syncs) once.
+        Nothing is written if any row fails.
+        """
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(query, seq_of_params)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def query(self, query, params=()):
+        """
+        Execute SELECT queries and return all rows.
+        """
+        with self.lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def version(self):
+        """
+        Data version token: the number of rows changed through this
+        connection so far. Every write goes through it, so an unchanged
+        value means the tables are unchanged too.
+        """
+        return self.conn.total_changes
+
+# Shared connection, created by init_db()
+_db = None
+
+# tasks.completed_at and pomodoros.timestamp hold INTEGER epoch seconds, which
+# compare and index as plain numbers; they are only formatted for display
+TASKS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        notes TEXT,
+        created_at TEXT DEFAULT (datetime('now')),
+        completed INTEGER DEFAULT 0,
+        completed_at INTEGER
+    )
+"""
+POMODOROS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS pomodoros (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER,
+        duration INTEGER,
+        timestamp INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+    )
+"""
+
+def _migrate_to_epoch(table, column, schema):
+    """
+    Older databases store `column` as local-time ISO text. Rebuild `table`
+    from `schema`, converting those values to epoch seconds and keeping ids
+    and the AUTOINCREMENT counter.
+    """
+    types = {row[1]: row[2] for row in _db.query(f"PRAGMA table_info({table})")}
+    if types.get(column, "").upper() != "TEXT":
+        return
+    cols = ", ".join(types)
+    values = ", ".join(
+        f"CAST(strftime('%s', {c}, 'utc') AS INTEGER)" if c == column else c for c in types
+    )
+    with _db.lock:
+        _db.conn.executescript(f"""
+            BEGIN;
+            ALTER TABLE {table} RENAME TO {table}_old;
+            {schema};
+            INSERT INTO {table} ({cols}) SELECT {values} FROM {table}_old;
+            DELETE FROM sqlite_sequence WHERE name = '{table}';
+            UPDATE sqlite_sequence SET name = '{table}' WHERE name = '{table}_old';
+            DROP TABLE {table}_old;
+            COMMIT;
         """)
-        conn.commit()
+
+def _day_start(day):
+    """Epoch seconds of local midnight at the start of `day`."""
+    return int(time.mktime(day.timetuple()))
+
+def init_db():
+    """Open the shared connection and initialize tables if they don't exist."""
+    global _db
+    if _db is None:
+        _db = DB()
+    _db.execute(TASKS_SCHEMA)
+    _db.execute(POMODOROS_SCHEMA)
+    # rebuilt tables lose their indexes, so this runs before they are created below
+    _migrate_to_epoch("tasks", "completed_at", TASKS_SCHEMA)
+    _migrate_to_epoch("pomodoros", "timestamp", POMODOROS_SCHEMA)
+    _db.execute("""
+        CREATE TABLE IF NOT EXISTS expenses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT DEFAULT (date('now')),
+            category TEXT,
+            description TEXT,
+            amount REAL
+        )
+    """)
+    # load_tasks orders by id (the rowid), so no created_at index is needed
+    _db.execute("DROP INDEX IF EXISTS idx_tasks_created")
+    # date-range lookups behind the analytics/dashboard refresh and the budget table
+    _db.execute("CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks(completed, completed_at)")
+    _db.execute("CREATE INDEX IF NOT EXISTS idx_pomo_ts ON pomodoros(timestamp)")
+    _db.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date)")
 
 def db_execute(query, params=()):
     """
-    Execute INSERT/UPDATE/DELETE queries.
+    Execute INSERT/UPDATE/DELETE queries on the shared connection.
     Returns the last inserted row id if available.
     """
-    with sqlite3.connect(DB_FILE) as conn:
-        c = conn.cursor()
-        c.execute(query, params)
-        conn.commit()
-        return c.lastrowid
+    return _db.execute(query, params)
+
+def db_executemany(query, seq_of_params):
+    """
+    Execute a bulk INSERT/UPDATE/DELETE on the shared connection as one
+    transaction (e.g. for importing or seeding many rows).
+    """
+    _db.executemany(query, seq_of_params)
 
 def db_query(query, params=()):
     """
-    Execute SELECT queries and return all rows.
+    Execute SELECT queries on the shared connection and return all rows.
     """
-    with sqlite3.connect(DB_FILE) as conn:
-        c = conn.cursor()
-        c.execute(query, params)
-        return c.fetchall()
+    return _db.query(query, params)
+
+def db_version():
+    return _db.version()
+
+class StatsCache:
+    """
+    Per-day counts for the last DAYS days, shared by the dashboard and the
+    analytics charts so they are queried once rather than once per chart.
+    refresh() only hits the database when the data version or the date changed.
+    """
+    DAYS = 14
+
+    def __init__(self):
+        self.key = None
+        self.days = []
+        self.done_by_day = []
+        self.pomo_by_day = []
+
+    def refresh(self):
+        today = datetime.date.today()
+        key = (today, db_version())
+        if key == self.key:
+            return
+        self.key = key
+
+        self.days = [today - datetime.timedelta(days=i) for i in range(self.DAYS - 1, -1, -1)]
+        since = _day_start(self.days[0])
+
+        # tasks completed per local day, grouped by SQLite into at most DAYS rows
+        counts = dict(db_query("""
+            SELECT date(completed_at, 'unixepoch', 'localtime') AS d, COUNT(*) FROM tasks
+            WHERE completed=1 AND completed_at >= ?
+            GROUP BY d
+        """, (since,)))
+        self.done_by_day = [counts.get(d.isoformat(), 0) for d in self.days]
+
+        # pomodoros per local day, grouped the same way
+        pcounts = dict(db_query("""
+            SELECT date(timestamp, 'unixepoch', 'localtime') AS d, COUNT(*) FROM pomodoros
+            WHERE timestamp >= ?
+            GROUP BY d
+        """, (since,)))
+        self.pomo_by_day = [pcounts.get(d.isoformat(), 0) for d in self.days]
 
 # ------------------------
 # To-Do Widget
@@ -98,41 +410,11 @@ class ToDoWidget(QWidget):
         self.load_tasks()
 
     def setup_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #121212;
-                color: #e9e9e9;
-            }
-            QLineEdit, QPushButton, QListWidget {
-                font-size: 14px;
-            }
-            QListWidget::item:selected {
-                background-color: #1565C0;
-                color: #ffffff;
-            }
-            QPushButton {
-                background-color: #1E1E1E;
-                color: #FFFFFF;
-                border: 1px solid #333;
-                padding: 6px 12px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #1565C0;
-            }
-            QLineEdit {
-                background-color: #1E1E1E;
-                border: 1px solid #333;
-                color: #ffffff;
-                padding: 6px;
-            }
-        """)
-
         layout = QVBoxLayout()
         self.setLayout(layout)
 
         header = QLabel("To-Do")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
+        header.setFont(_font("Arial", 16, QFont.Bold))
         layout.addWidget(header)
 
         hl = QHBoxLayout()
@@ -162,34 +444,55 @@ class ToDoWidget(QWidget):
         layout.addLayout(btn_row)
 
         note = QLabel("Double-click a task to edit it.")
-        note.setStyleSheet("color: gray; font-size: 11px")
+        note.setObjectName("todoHint")
         layout.addWidget(note)
 
+    def _make_task_item(self, tid, title, completed):
+        item = QListWidgetItem(title)
+        item.setData(Qt.UserRole, tid)
+        if completed:
+            self._style_done(item)
+        return item
+
+    def _style_done(self, item):
+        item.setForeground(Qt.gray)
+        font = item.font()
+        font.setStrikeOut(True)
+        item.setFont(font)
+
     def load_tasks(self):
+        rows = db_query("SELECT id, title, completed FROM tasks ORDER BY id DESC")
+        items = [self._make_task_item(tid, title, completed) for tid, title, completed in rows]
+
+        # fill with signals and repaints suspended so the list lays out once, not per item
+        self.task_list.blockSignals(True)
+        self.task_list.setUpdatesEnabled(False)
         self.task_list.clear()
-        rows = db_query("SELECT id, title, completed FROM tasks ORDER BY created_at DESC")
-        for tid, title, completed in rows:
-            item = QListWidgetItem(title)
-            item.setData(Qt.UserRole, tid)
-            if completed:
-                item.setForeground(Qt.gray)
-                font = item.font()
-                font.setStrikeOut(True)
-                item.setFont(font)
+        for item in items:
             self.task_list.addItem(item)
+        self.task_list.setUpdatesEnabled(True)
+        self.task_list.blockSignals(False)
         
-        if hasattr(self.parent, "analytics_widget"):
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        # the analytics page is only built once it has been opened
+        if getattr(self.parent, "analytics_widget", None) is not None:
             self.parent.analytics_widget.update_stats()
 
+    # add/edit/mark/delete update the affected item in place; load_tasks is only
+    # needed for the initial fill or an explicit refresh
     def add_task(self):
         title = self.task_input.text().strip()
         if not title:
             QMessageBox.warning(self, "Warning", "Please enter a task.")
             return
         now = datetime.datetime.now().isoformat()
-        db_execute("INSERT INTO tasks (title, created_at) VALUES (?, ?)", (title, now))
+        tid = db_execute("INSERT INTO tasks (title, created_at) VALUES (?, ?)", (title, now))
         self.task_input.clear()
-        self.load_tasks()
+        # newest first, matching load_tasks
+        self.task_list.insertItem(0, self._make_task_item(tid, title, False))
+        self._refresh_stats()
 
     def edit_task_dialog(self, item):
         tid = item.data(Qt.UserRole)
@@ -199,7 +502,7 @@ class ToDoWidget(QWidget):
         text, ok = QInputDialog.getText(self, "Edit Task", "Task:", text=old)
         if ok and text.strip():
             db_execute("UPDATE tasks SET title=? WHERE id=?", (text.strip(), tid))
-            self.load_tasks()
+            item.setText(text.strip())
 
     def mark_done(self):
         item = self.task_list.currentItem()
@@ -207,9 +510,9 @@ class ToDoWidget(QWidget):
             QMessageBox.warning(self, "Warning", "Select a task")
             return
         tid = item.data(Qt.UserRole)
-        now = datetime.datetime.now().isoformat()
-        db_execute("UPDATE tasks SET completed=1, completed_at=? WHERE id=?", (now, tid))
-        self.load_tasks()
+        db_execute("UPDATE tasks SET completed=1, completed_at=? WHERE id=?", (int(time.time()), tid))
+        self._style_done(item)
+        self._refresh_stats()
 
     def delete_task(self):
         item = self.task_list.currentItem()
@@ -221,7 +524,8 @@ class ToDoWidget(QWidget):
         if confirm != QMessageBox.Yes:
             return
         db_execute("DELETE FROM tasks WHERE id=?", (tid,))
-        self.load_tasks()
+        self.task_list.takeItem(self.task_list.row(item))
+        self._refresh_stats()
 
     def select_for_pomodoro(self):
         item = self.task_list.currentItem()
@@ -251,50 +555,25 @@ class PomodoroWidget(QWidget):
         self.remaining = self.work_duration
         self.pomodoros_done = 0
         self.current_task_id = None
+        # The countdown is measured on a monotonic clock from when the session
+        # (re)started; ticks only refresh the display, so late or dropped
+        # ticks cannot make the session drift. `remaining` is in seconds.
+        self._clock = QElapsedTimer()
+        self._remaining_at_start = self.remaining
         self.timer = QTimer()
-        self.timer.setInterval(1000)
+        self.timer.setInterval(250)
         self.timer.timeout.connect(self._tick)
 
     def setup_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #121212;
-                color: #e9e9e9;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QPushButton {
-                background-color: #1E1E1E;
-                color: #FFFFFF;
-                border: 1px solid #333;
-                padding: 6px 12px;
-                border-radius: 4px;
-            }
-            QPushButton:disabled {
-                background-color: #333;
-                color: #888;
-            }
-            QPushButton:hover:!disabled {
-                background-color: #1565C0;
-            }
-            QSpinBox {
-                background-color: #1E1E1E;
-                color: #ffffff;
-                border: 1px solid #333;
-                padding: 2px 4px;
-            }
-        """)
-
         layout = QVBoxLayout()
         self.setLayout(layout)
 
         header = QLabel("Pomodoro")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
+        header.setFont(_font("Arial", 16, QFont.Bold))
         layout.addWidget(header)
 
         self.timer_label = QLabel("25:00")
-        self.timer_label.setFont(QFont("Consolas", 36, QFont.Bold))
+        self.timer_label.setFont(_font("Consolas", 36, QFont.Bold))
         self.timer_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.timer_label)
 
@@ -355,6 +634,8 @@ class PomodoroWidget(QWidget):
             self.is_running = True
             if self.is_work and self.remaining <= 0:
                 self.remaining = self.work_duration
+            self._remaining_at_start = self.remaining
+            self._clock.start()
             self.timer.start()
             self.start_btn.setEnabled(False)
             self.pause_btn.setEnabled(True)
@@ -363,6 +644,8 @@ class PomodoroWidget(QWidget):
         if self.is_running:
             self.is_running = False
             self.timer.stop()
+            self.remaining = self._time_left()
+            self._update_label()
             self.start_btn.setEnabled(True)
             self.pause_btn.setEnabled(False)
 
@@ -373,9 +656,12 @@ class PomodoroWidget(QWidget):
         self._update_label()
         self.session_label.setText("Session: Work")
 
+    def _time_left(self):
+        return max(0.0, self._remaining_at_start - self._clock.elapsed() / 1000)
+
     def _tick(self):
+        self.remaining = self._time_left()
         if self.remaining > 0:
-            self.remaining -= 1
             self._update_label()
         else:
             self.timer.stop()
@@ -403,24 +689,28 @@ class PomodoroWidget(QWidget):
 
             self._update_label()
 
-            if hasattr(self.parent, "analytics_widget"):
+            if getattr(self.parent, "analytics_widget", None) is not None:
                 self.parent.analytics_widget.update_stats()
 
             if self.current_task_id and not self.is_work:
                 resp = QMessageBox.question(self, "Pomodoro finished", "Mark selected task as completed?")
                 if resp == QMessageBox.Yes:
-                    now = datetime.datetime.now().isoformat()
-                    db_execute("UPDATE tasks SET completed=1, completed_at=? WHERE id=?", (now, self.current_task_id))
+                    db_execute("UPDATE tasks SET completed=1, completed_at=? WHERE id=?",
+                               (int(time.time()), self.current_task_id))
                     self.parent.todo_widget.load_tasks()
 
     def _record_pomodoro(self):
         dur = int(self.work_spin.value()) * 60
-        ts = datetime.datetime.now().isoformat()
-        db_execute("INSERT INTO pomodoros (task_id, duration, timestamp) VALUES (?,?, ?)", (self.current_task_id, dur, ts))
+        db_execute("INSERT INTO pomodoros (task_id, duration, timestamp) VALUES (?,?, ?)",
+                   (self.current_task_id, dur, int(time.time())))
 
     def _update_label(self):
-        m, s = divmod(self.remaining, 60)
-        self.timer_label.setText(f"{int(m):02d}:{int(s):02d}")
+        # round up so the display reaches 00:00 exactly when the session ends
+        m, s = divmod(math.ceil(self.remaining), 60)
+        text = f"{int(m):02d}:{int(s):02d}"
+        # the timer fires four times a second; only touch the label on change
+        if text != self.timer_label.text():
+            self.timer_label.setText(text)
 
 
 # ------------------------
@@ -430,24 +720,20 @@ class AnalyticsWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        # shared with the dashboard when running inside MainWindow
+        self.stats = getattr(parent, "stats", None) or StatsCache()
+        # what the charts were last drawn from; None forces the first draw
+        self._charts_key = None
+        self._labels_key = None
         self.setup_ui()
         self.update_stats()
 
     def setup_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #121212;
-                color: #e9e9e9;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-        """)
         layout = QVBoxLayout()
         self.setLayout(layout)
 
         header = QLabel("Analytics")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
+        header.setFont(_font("Arial", 16, QFont.Bold))
         layout.addWidget(header)
 
         self.tasks_total_lbl = QLabel("Tasks total: 0")
@@ -456,27 +742,42 @@ class AnalyticsWidget(QWidget):
         self.focus_time_lbl = QLabel("Focus time (min): 0")
 
         for lbl in [self.tasks_total_lbl, self.tasks_done_lbl, self.pomo_total_lbl, self.focus_time_lbl]:
-            lbl.setFont(QFont("Arial", 12))
+            lbl.setFont(_font("Arial", 12))
             layout.addWidget(lbl)
 
         charts_row = QHBoxLayout()
         # Tasks completed chart
-        self.fig1, self.ax1 = plt.subplots(figsize=(4, 3), facecolor="#121212")
+        self.fig1 = Figure(figsize=(4, 3), facecolor="#121212")
+        self.ax1 = self.fig1.add_subplot(111)
         self._style_ax_dark(self.ax1)
         self.canvas1 = FigureCanvas(self.fig1)
-        self.canvas1.setStyleSheet("background-color: transparent;")
+        self.canvas1.setObjectName("chartCanvas")
         self.canvas1.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         charts_row.addWidget(self.canvas1)
 
         # Pomodoros chart
-        self.fig2, self.ax2 = plt.subplots(figsize=(4, 3), facecolor="#121212")
+        self.fig2 = Figure(figsize=(4, 3), facecolor="#121212")
+        self.ax2 = self.fig2.add_subplot(111)
         self._style_ax_dark(self.ax2)
         self.canvas2 = FigureCanvas(self.fig2)
-        self.canvas2.setStyleSheet("background-color: transparent;")
+        self.canvas2.setObjectName("chartCanvas")
         self.canvas2.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         charts_row.addWidget(self.canvas2)
         layout.addLayout(charts_row)
 
+        # The 14 bars / points are created once; update_charts only changes
+        # their heights, and the day labels when the date rolls over
+        x = range(14)
+        self.bars1 = self.ax1.bar(x, [0] * 14, color="#1565C0")
+        self.ax1.set_title("Tasks Completed (last 14 days)")
+        self.line2, = self.ax2.plot(x, [0] * 14, marker='o', color="#FFB300", linewidth=2)
+        self.ax2.set_title("Pomodoros (last 14 days)")
+        for ax in (self.ax1, self.ax2):
+            ax.set_xticks(x)
+            ax.tick_params(axis='x', rotation=45)
+        # first day the x tick labels were drawn for
+        self._labels_from = None
+
     def _style_ax_dark(self, ax):
         ax.set_facecolor("#1e1e1e")
         ax.tick_params(colors="white", labelcolor="white")
@@ -490,103 +791,191 @@ class AnalyticsWidget(QWidget):
         ax.grid(True, color="#333333", linestyle="--", linewidth=0.5, alpha=0.5)
 
     def update_stats(self):
-        tasks = db_query("SELECT id, completed, completed_at FROM tasks")
-        total = len(tasks)
-        done_today = 0
-        for tid, completed, completed_at in tasks:
-            if completed and completed_at:
-                try:
-                    dt = datetime.datetime.fromisoformat(completed_at)
-                    if dt.date() == datetime.date.today():
-                        done_today += 1
-                except:
-                    pass
-
-        pomos = db_query("SELECT timestamp, duration FROM pomodoros")
-        pomo_total = len(pomos)
-        focus_minutes = sum((p[1] for p in pomos), 0) // 60 if pomos else 0
+        self.update_labels()
+        self.update_charts()
+
+    def showEvent(self, event):
+        # charts are skipped while hidden, so catch up when the page is shown
+        super().showEvent(event)
+        self.update_charts()
+
+    def update_labels(self):
+        # nothing written since the last refresh (and still the same day): the
+        # labels already show the current numbers
+        key = (datetime.date.today(), db_version())
+        if key == self._labels_key:
+            return
+        self._labels_key = key
+
+        # all four label values in one round-trip; completed_at is epoch
+        # seconds, so ">= local midnight" picks out everything completed today
+        today = _day_start(key[0])
+        total, done_today, pomo_total, focus_seconds = db_query("""
+            SELECT COUNT(*),
+                   COALESCE(SUM(completed = 1 AND completed_at >= ?), 0),
+                   (SELECT COUNT(*) FROM pomodoros),
+                   (SELECT COALESCE(SUM(duration), 0) FROM pomodoros)
+            FROM tasks
+        """, (today,))[0]
+        focus_minutes = focus_seconds // 60
 
         self.tasks_total_lbl.setText(f"Tasks total: {total}")
         self.tasks_done_lbl.setText(f"Tasks done today: {done_today}")
         self.pomo_total_lbl.setText(f"Pomodoros total: {pomo_total}")
         self.focus_time_lbl.setText(f"Focus time (min): {focus_minutes}")
 
+    def update_charts(self):
+        # Rendering is the expensive part: skip it while the page is hidden or
+        # when nothing the charts show has changed since the last draw
+        if not self.isVisible():
+            return
+        stats = self.stats
+        stats.refresh()
+        if stats.key == self._charts_key:
+            return
+        self._charts_key = stats.key
+
+        days = stats.days
+        if days[0] != self._labels_from:
+            self._labels_from = days[0]
+            x = [d.strftime("%b %d") for d in days]
+            for ax, fig in ((self.ax1, self.fig1), (self.ax2, self.fig2)):
+                ax.set_xticklabels(x)
+                fig.tight_layout()
+
         # Tasks completed chart (last 14 days)
-        self.ax1.clear()
-        self._style_ax_dark(self.ax1)
-        rows = db_query("SELECT completed_at FROM tasks WHERE completed=1 AND completed_at IS NOT NULL")
-        dates = []
-        for (ts,) in rows:
-            try:
-                dates.append(datetime.datetime.fromisoformat(ts).date())
-            except:
-                pass
-        counts = Counter(dates)
-        last_days = [datetime.date.today() - datetime.timedelta(days=i) for i in range(13, -1, -1)]
-        x = [d.strftime("%b %d") for d in last_days]
-        y = [counts.get(d, 0) for d in last_days]
-        self.ax1.bar(x, y, color="#1565C0")
-        self.ax1.set_title("Tasks Completed (last 14 days)")
-        self.ax1.tick_params(axis='x', rotation=45)
-        self.fig1.tight_layout()
-        self.canvas1.draw()
+        for rect, h in zip(self.bars1, stats.done_by_day):
+            rect.set_height(h)
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+        self.canvas1.draw_idle()
 
         # Pomodoros chart (last 14 days)
-        self.ax2.clear()
-        self._style_ax_dark(self.ax2)
-        rows = db_query("SELECT timestamp FROM pomodoros")
-        pdays = []
-        for (ts,) in rows:
-            try:
-                pdays.append(datetime.datetime.fromisoformat(ts).date())
-            except:
-                pass
-        pcounts = Counter(pdays)
-        y2 = [pcounts.get(d, 0) for d in last_days]
-        self.ax2.plot(x, y2, marker='o', color="#FFB300", linewidth=2)
-        self.ax2.set_title("Pomodoros (last 14 days)")
-        self.ax2.tick_params(axis='x', rotation=45)
-        self.fig2.tight_layout()
-        self.canvas2.draw()
+        self.line2.set_ydata(stats.pomo_by_day)
+        self.ax2.relim()
+        self.ax2.autoscale_view()
+        self.canvas2.draw_idle()
+
+
+# ------------------------
+# Budget Widget
+# ------------------------
+class ExpenseTableModel(QAbstractTableModel):
+    """
+    Read-only model behind the expenses table, holding one numpy array per
+    column. Cells are formatted on request, so no per-cell item objects are
+    kept, and sorting is an argsort over the column array.
+    """
+    HEADERS = ["Date", "Category", "Description", "Amount (₦)"]
+    # array attributes, in the order of the rows passed to set_rows/insert_row
+    COLUMNS = ("ids", "dates", "cats", "descs", "amts")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # column and order of the view's sort indicator; None keeps query order
+        self._sort = None
+        self.set_rows([])
+
+    def set_rows(self, rows):
+        """Replace the contents with (id, date, category, description, amount) rows."""
+        ids, dates, cats, descs, amts = zip(*rows) if rows else ((),) * 5
+        self.beginResetModel()
+        self.ids = np.array(ids, dtype=np.int64)
+        self.dates = np.array(dates, dtype=object)
+        self.cats = np.array(cats, dtype=object)
+        self.descs = np.array(descs, dtype=object)
+        self.amts = np.array(amts, dtype=np.float64)
+        if self._sort is not None:
+            self._apply_sort(*self._sort)
+        self.endResetModel()
+
+    def row_id(self, row):
+        return int(self.ids[row])
+
+    def row_amount(self, row):
+        return float(self.amts[row])
+
+    def insert_row(self, row):
+        """Add one (id, date, category, description, amount) row where the current sort puts it."""
+        pos = self._insert_pos(row)
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        for name, value in zip(self.COLUMNS, row):
+            setattr(self, name, np.insert(getattr(self, name), pos, value))
+        self.endInsertRows()
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for name in self.COLUMNS:
+            setattr(self, name, np.delete(getattr(self, name), row))
+        self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row, col = index.row(), index.column()
+        if col == 3:
+            return f"{self.amts[row]:.2f}"
+        return (self.dates, self.cats, self.descs)[col][row]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        # default row numbers on the vertical header, as QTableWidget showed
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort = (column, order)
+        self.beginResetModel()
+        self._apply_sort(column, order)
+        self.endResetModel()
+
+    def _sort_keys(self, column):
+        keys = (self.dates, self.cats, self.descs, self.amts)[column]
+        return keys.astype(str) if keys.dtype == object else keys
+
+    def _apply_sort(self, column, order):
+        perm = np.argsort(self._sort_keys(column), kind="stable")
+        if order == Qt.DescendingOrder:
+            perm = perm[::-1]
+        for name in self.COLUMNS:
+            setattr(self, name, getattr(self, name)[perm])
+
+    def _insert_pos(self, row):
+        # binary search on the sorted column; unsorted rows go first, as the
+        # newest-first query would put a new row
+        if self._sort is None:
+            return 0
+        column, order = self._sort
+        keys = self._sort_keys(column)
+        key = row[column + 1]
+        if keys.dtype != np.float64:
+            key = str(key)
+        if order == Qt.DescendingOrder:
+            return len(keys) - int(np.searchsorted(keys[::-1], key, side="left"))
+        return int(np.searchsorted(keys, key, side="right"))
 
 
 class BudgetWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        # running PDF export, kept referenced until it reports back
+        self._pdf_task = None
         self.setup_ui()
         self.load_expenses()
 
     def setup_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #121212;
-                color: #e9e9e9;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QLineEdit, QDateEdit, QTableWidget {
-                background-color: #1e1e1e;
-                color: #ffffff;
-                border: 1px solid #333333;
-            }
-            QPushButton {
-                background-color: #1565C0;
-                color: white;
-                border-radius: 4px;
-                padding: 6px;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-        """)
-
         layout = QVBoxLayout(self)
 
         # ---------- Header ----------
         header = QLabel("Budget Planner")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
+        header.setFont(_font("Arial", 16, QFont.Bold))
         layout.addWidget(header)
 
         # ---------- Form ----------
@@ -622,68 +1011,39 @@ class BudgetWidget(QWidget):
         layout.addLayout(btn_row)
 
         # ---------- Table ----------
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(
-            ["Date", "Category", "Description", "Amount (₦)"]
-        )
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.model = ExpenseTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
+        # header clicks sort through the model; start newest first like the query
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.DescendingOrder)
 
-        # Header styling
-        self.table.horizontalHeader().setStyleSheet("""
-            QHeaderView::section {
-                background-color: #1e1e1e;
-                color: white;
-                padding: 6px;
-                border: 1px solid #333;
-                font-weight: bold;
-            }
-        """)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.horizontalHeader().setStretchLastSection(True)
 
-        # Row styling
-        self.table.setStyleSheet("""
-            QTableWidget {
-                alternate-background-color: #181818;
-                gridline-color: #333;
-            }
-            QTableWidget::item {
-                padding: 6px;
-            }
-        """)
-
         layout.addWidget(self.table)
 
         # ---------- Total ----------
         self.total_lbl = QLabel("Total: ₦0.00")
-        self.total_lbl.setFont(QFont("Arial", 12, QFont.Bold))
+        self.total_lbl.setFont(_font("Arial", 12, QFont.Bold))
         layout.addWidget(self.total_lbl)
 
     # ---------- Load ----------
     def load_expenses(self):
-        self.table.setRowCount(0)
         rows = db_query(
             "SELECT id, date, category, description, amount FROM expenses ORDER BY date DESC"
         )
+        self._total = db_query("SELECT COALESCE(SUM(amount), 0.0) FROM expenses")[0][0]
 
-        total = 0.0
-        for rid, date, cat, desc, amt in rows:
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-
-            self.table.setItem(r, 0, QTableWidgetItem(date))
-            self.table.setItem(r, 1, QTableWidgetItem(cat))
-            self.table.setItem(r, 2, QTableWidgetItem(desc))
-
-            amt_item = QTableWidgetItem(f"{amt:.2f}")
-            amt_item.setData(Qt.UserRole, rid)  # SAFE row ID storage
-            self.table.setItem(r, 3, amt_item)
-
-            total += amt
+        # one model reset instead of per-cell items; the current sort is kept
+        self.model.set_rows(rows)
+        self._update_total()
 
-        self.total_lbl.setText(f"Total: ₦{total:.2f}")
+    def _update_total(self):
+        self.total_lbl.setText(f"Total: ₦{self._total:.2f}")
 
     # ---------- Add ----------
     def add_expense(self):
@@ -702,7 +1062,7 @@ class BudgetWidget(QWidget):
             QMessageBox.warning(self, "Warning", "Amount must be a number")
             return
 
-        db_execute(
+        rid = db_execute(
             "INSERT INTO expenses (date, category, description, amount) VALUES (?, ?, ?, ?)",
             (date, cat, desc, amt)
         )
@@ -710,33 +1070,33 @@ class BudgetWidget(QWidget):
         self.cat_input.clear()
         self.desc_input.clear()
         self.amount_input.clear()
-        self.load_expenses()
+
+        # add just this row and adjust the total; load_expenses is only for the initial fill
+        self.model.insert_row((rid, date, cat, desc, amt))
+        self._total += amt
+        self._update_total()
 
     # ---------- Delete ----------
     def delete_selected(self):
-        row = self.table.currentRow()
-        if row < 0:
+        index = self.table.currentIndex()
+        if not index.isValid():
             QMessageBox.warning(self, "Warning", "Select an expense")
             return
 
-        rid = self.table.item(row, 3).data(Qt.UserRole)
-        if rid is None:
-            QMessageBox.warning(self, "Error", "Invalid row")
-            return
+        rid = self.model.row_id(index.row())  # SAFE row ID lookup
 
         confirm = QMessageBox.question(self, "Delete", "Delete this expense?")
         if confirm != QMessageBox.Yes:
             return
 
         db_execute("DELETE FROM expenses WHERE id=?", (rid,))
-        self.load_expenses()
+        self._total -= self.model.row_amount(index.row())
+        self.model.remove_row(index.row())
+        self._update_total()
 
     # ---------- PDF ----------
     def generate_pdf(self):
-        rows = db_query(
-            "SELECT date, category, description, amount FROM expenses ORDER BY date DESC"
-        )
-        if not rows:
+        if not db_query("SELECT EXISTS(SELECT 1 FROM expenses)")[0][0]:
             QMessageBox.information(self, "No data", "No expenses to export")
             return
 
@@ -746,14 +1106,76 @@ class BudgetWidget(QWidget):
         if not filename:
             return
 
-        doc = SimpleDocTemplate(filename, pagesize=letter)
-        elements = []
+        # build the PDF on the thread pool so the UI stays responsive; the
+        # task reports back through queued signals
+        self.pdf_btn.setEnabled(False)
+        self._pdf_task = PdfExportTask(filename)
+        self._pdf_task.signals.finished.connect(self._on_pdf_saved)
+        self._pdf_task.signals.failed.connect(self._on_pdf_failed)
+        QThreadPool.globalInstance().start(self._pdf_task)
+
+    def _on_pdf_saved(self, filename):
+        self.pdf_btn.setEnabled(True)
+        self._pdf_task = None
+        QMessageBox.information(self, "Saved", f"Saved PDF to {filename}")
+
+    def _on_pdf_failed(self, message):
+        self.pdf_btn.setEnabled(True)
+        self._pdf_task = None
+        QMessageBox.warning(self, "Error", f"Could not save PDF: {message}")
+
+
+class _PdfSignals(QObject):
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
 
-        data = [["Date", "Category", "Description", "Amount (₦)"]]
-        for d, c, desc, a in rows:
-            data.append([d, c, desc, f"{a:.2f}"])
 
-        table = Table(data)
+class PdfExportTask(QRunnable):
+    """
+    Writes the expense receipt PDF off the UI thread. Uses its own
+    connection and never touches widgets; results go out via signals.
+    """
+    def __init__(self, filename):
+        super().__init__()
+        self.filename = filename
+        self.signals = _PdfSignals()
+
+    def run(self):
+        try:
+            conn = _connect()
+            try:
+                self.build(conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.filename)
+
+    def build(self, conn):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib import colors as reportlab_colors
+        from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Spacer, Image as PlatypusImage
+
+        doc = SimpleDocTemplate(self.filename, pagesize=letter)
+        elements = []
+
+        def stream_rows():
+            # rows come off the cursor PDF_CHUNK_ROWS at a time rather than
+            # as one fetchall() list
+            cur = conn.execute(
+                "SELECT date, category, description, amount FROM expenses ORDER BY date DESC"
+            )
+            while True:
+                rows = cur.fetchmany(PDF_CHUNK_ROWS)
+                if not rows:
+                    return
+                for d, c, desc, a in rows:
+                    yield [d, c, desc, f"{a:.2f}"]
+
+        # LongTable lays out long tables page by page; the header repeats on each
+        header = ["Date", "Category", "Description", "Amount (₦)"]
+        table = LongTable([header] + list(stream_rows()), repeatRows=1)
         table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), reportlab_colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), reportlab_colors.whitesmoke),
@@ -763,32 +1185,35 @@ class BudgetWidget(QWidget):
         elements.append(table)
         elements.append(Spacer(1, 12))
 
-        # Chart (dark theme)
-        fig, ax = plt.subplots(figsize=(6, 3), facecolor="#121212")
+        # Chart (dark theme); the object-oriented Agg API is safe off the main thread
+        width, height = PDF_CHART_SIZE
+        fig = Figure(figsize=(width / PDF_CHART_DPI, height / PDF_CHART_DPI),
+                     dpi=PDF_CHART_DPI, facecolor="#121212")
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
         ax.set_facecolor("#1e1e1e")
         ax.tick_params(colors="white")
         for spine in ax.spines.values():
             spine.set_color("white")
 
-        agg = defaultdict(float)
-        for _, cat, _, amt in rows:
-            agg[cat] += amt
-
-        ax.bar(agg.keys(), agg.values(), color="#FFB300")
+        # per-category totals summed by SQLite
+        totals = conn.execute(
+            "SELECT category, SUM(amount) FROM expenses GROUP BY category"
+        ).fetchall()
+        ax.bar([cat for cat, _ in totals], [total for _, total in totals], color="#FFB300")
         ax.set_title("Expenses by Category", color="white")
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
+        for lbl in ax.get_xticklabels():
+            lbl.set_rotation(45)
+            lbl.set_ha("right")
+        fig.tight_layout()
 
         buf = io.BytesIO()
-        fig.savefig(buf, format="PNG", facecolor="#121212")
-        plt.close(fig)
+        fig.savefig(buf, format="PNG", dpi=PDF_CHART_DPI, facecolor="#121212")
         buf.seek(0)
 
-        elements.append(PlatypusImage(buf, width=400, height=200))
+        elements.append(PlatypusImage(buf, width=width, height=height))
         doc.build(elements)
 
-        QMessageBox.information(self, "Saved", f"Saved PDF to {filename}")
-
 
 
 
@@ -799,29 +1224,14 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         init_db()
+        # per-day counts behind both the dashboard and analytics charts
+        self.stats = StatsCache()
+        # what the dashboard chart was last drawn from; None forces the first draw
+        self._db_chart_key = None
+        self._overview_key = None
         self.setWindowTitle("Productivity Suite — Dashboard")
         self.resize(1100, 700)
         self.setup_ui()
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #121212;
-            }
-            QLabel {
-                color: #e9e9e9;
-            }
-            QPushButton {
-                background-color: #1565C0;
-                color: white;
-                border-radius: 4px;
-                padding: 5px;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-            QFrame {
-                background-color: #1e1e1e;
-            }
-        """)
 
     def setup_ui(self):
         # Central widget
@@ -838,7 +1248,7 @@ class MainWindow(QMainWindow):
         sidebar_widget.setFrameShape(QFrame.StyledPanel)
 
         title = QLabel("Productivity Suite")
-        title.setFont(QFont("Times New Roman", 18, QFont.Bold))
+        title.setFont(_font("Times New Roman", 18, QFont.Bold))
         title.setAlignment(Qt.AlignCenter)
         sidebar.addWidget(title)
         sidebar.addSpacing(15)
@@ -862,7 +1272,7 @@ class MainWindow(QMainWindow):
 
         # Top header
         self.header_lbl = QLabel("Welcome — Dashboard")
-        self.header_lbl.setFont(QFont("Times New Roman", 14, QFont.Bold))
+        self.header_lbl.setFont(_font("Times New Roman", 14, QFont.Bold))
         content_layout.addWidget(self.header_lbl)
 
         # Stacked pages
@@ -873,30 +1283,32 @@ class MainWindow(QMainWindow):
         self.dashboard_tab = QWidget()
         self.todo_widget = ToDoWidget(parent=self)
         self.pomodoro_widget = PomodoroWidget(parent=self)
-        self.analytics_widget = AnalyticsWidget(parent=self)
-        self.budget_widget = BudgetWidget(parent=self)
+        # Analytics (charts) and Budget (full expense history) are built the
+        # first time their page is opened; see _ensure
+        self.analytics_widget = None
+        self.budget_widget = None
 
         # Add pages to stacked widget
         self.pages.addWidget(self.dashboard_tab)    # index 0
         self.pages.addWidget(self.todo_widget)      # index 1
         self.pages.addWidget(self.pomodoro_widget)  # index 2
-        self.pages.addWidget(self.analytics_widget) # index 3
-        self.pages.addWidget(self.budget_widget)    # index 4
+        self.pages.addWidget(QWidget())             # index 3, analytics placeholder
+        self.pages.addWidget(QWidget())             # index 4, budget placeholder
 
         # Dashboard layout
         d_layout = QVBoxLayout()
         self.dashboard_tab.setLayout(d_layout)
         d_title = QLabel("Dashboard Overview")
-        d_title.setFont(QFont("Arial", 16, QFont.Bold))
+        d_title.setFont(_font("Arial", 16, QFont.Bold))
         d_layout.addWidget(d_title)
 
         self.overview_label = QLabel("")
-        self.overview_label.setFont(QFont("Arial", 12, QFont.Bold))
+        self.overview_label.setFont(_font("Arial", 12, QFont.Bold))
         d_layout.addWidget(self.overview_label)
 
         small_hr = QFrame()
         small_hr.setFrameShape(QFrame.HLine)
-        small_hr.setStyleSheet("color: #555555;")
+        small_hr.setObjectName("dashboardDivider")
         d_layout.addWidget(small_hr)
 
         # Quick summary widgets
@@ -915,17 +1327,28 @@ class MainWindow(QMainWindow):
         quick_left.addWidget(self.quick_focus_lbl)
 
         # Dashboard chart
-        self.db_fig, self.db_ax = plt.subplots(figsize=(5, 3), facecolor="#121212")
+        self.db_fig = Figure(figsize=(5, 3), facecolor="#121212")
+        self.db_ax = self.db_fig.add_subplot(111)
         self.db_ax.set_facecolor("#1e1e1e")
         self.db_canvas = FigureCanvas(self.db_fig)
         quick_right.addWidget(self.db_canvas)
+        # bars and styling are set up once; update_dashboard_chart changes heights
+        self.db_bars = self.db_ax.bar(range(7), [0] * 7, color="#FFB300")
+        self.db_ax.set_title("Pomodoros (last 7 days)", color="white")
+        self.db_ax.set_xticks(range(7))
+        self.db_ax.tick_params(axis='x', rotation=45, colors="white")
+        self.db_ax.tick_params(axis='y', colors="white")
+        # first day the x tick labels were drawn for
+        self._db_labels_from = None
 
         # Connect sidebar buttons to pages and header
         self.btn_dashboard.clicked.connect(lambda: (self.pages.setCurrentIndex(0), self.set_header("Dashboard")))
         self.btn_todo.clicked.connect(lambda: (self.pages.setCurrentIndex(1), self.set_header("To-Do")))
         self.btn_pomodoro.clicked.connect(lambda: (self.pages.setCurrentIndex(2), self.set_header("Pomodoro")))
-        self.btn_analytics.clicked.connect(lambda: (self.pages.setCurrentIndex(3), self.set_header("Analytics")))
-        self.btn_budget.clicked.connect(lambda: (self.pages.setCurrentIndex(4), self.set_header("Budget")))
+        self.btn_analytics.clicked.connect(lambda: (self._ensure(3), self.pages.setCurrentIndex(3), self.set_header("Analytics")))
+        self.btn_budget.clicked.connect(lambda: (self._ensure(4), self.pages.setCurrentIndex(4), self.set_header("Budget")))
+
+        self.pages.currentChanged.connect(self._on_page_changed)
 
         # Put sidebar and content in main layout
         main_layout.addWidget(sidebar_widget)
@@ -934,54 +1357,111 @@ class MainWindow(QMainWindow):
         # Refresh summary timer
         self.refresh_timer = QTimer()
         self.refresh_timer.setInterval(2000)
-        self.refresh_timer.timeout.connect(self.update_overview)
-        self.refresh_timer.start()
+        self.refresh_timer.timeout.connect(self._on_refresh_tick)
+        # started by showEvent and stopped while the window is hidden or minimized
 
         # Initial update
         self.update_overview()
 
+    def _ensure(self, index):
+        # build a lazy page on first use and swap it in for its placeholder;
+        # called before the page becomes current, so the swap is never visible
+        if index == 3 and self.analytics_widget is None:
+            self.analytics_widget = AnalyticsWidget(parent=self)
+            self._replace_page(index, self.analytics_widget)
+        elif index == 4 and self.budget_widget is None:
+            self.budget_widget = BudgetWidget(parent=self)
+            self._replace_page(index, self.budget_widget)
+
+    def _replace_page(self, index, widget):
+        placeholder = self.pages.widget(index)
+        self.pages.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.pages.insertWidget(index, widget)
+
     # Method to update the header text
     def set_header(self, text):
         self.header_lbl.setText(f"Welcome to {text}")
 
     # Update dashboard overview
     def update_overview(self):
-        rows = db_query("SELECT COUNT(*) FROM tasks")
-        total_tasks = rows[0][0] if rows else 0
-        rows = db_query("SELECT COUNT(*) FROM pomodoros")
-        total_pomos = rows[0][0] if rows else 0
-        rows = db_query("SELECT SUM(amount) FROM expenses")
-        total_spent = rows[0][0] if rows and rows[0][0] is not None else 0.0
-        rows = db_query("SELECT SUM(duration) FROM pomodoros")
-        total_focus_min = (rows[0][0] if rows and rows[0][0] is not None else 0) // 60
+        # the charts and analytics labels keep their own version checks; the
+        # analytics charts skip themselves while hidden, but must follow a date
+        # rollover while their page is on screen
+        self.update_dashboard_chart()
+        if self.analytics_widget is not None:
+            self.analytics_widget.update_labels()
+            self.analytics_widget.update_charts()
+
+        key = db_version()
+        if key == self._overview_key:
+            return
+        self._overview_key = key
+
+        total_tasks, total_pomos, total_spent, total_focus = db_query("""
+            SELECT (SELECT COUNT(*) FROM tasks),
+                   (SELECT COUNT(*) FROM pomodoros),
+                   (SELECT COALESCE(SUM(amount), 0.0) FROM expenses),
+                   (SELECT COALESCE(SUM(duration), 0) FROM pomodoros)
+        """)[0]
+        total_focus_min = total_focus // 60
 
         self.quick_tasks_lbl.setText(f"Tasks: {total_tasks}")
         self.quick_pomo_lbl.setText(f"Pomodoros: {total_pomos}")
         self.quick_focus_lbl.setText(f"Focus (min): {total_focus_min}")
         self.overview_label.setText(f"Total spent: ₦{total_spent:.2f}")
 
-        # Dashboard chart: pomodoros last 7 days
-        self.db_ax.clear()
-        rows = db_query("SELECT timestamp FROM pomodoros")
-        dates = []
-        for (ts,) in rows:
-            try:
-                dates.append(datetime.datetime.fromisoformat(ts).date())
-            except:
-                pass
-        counts = Counter(dates)
-        last7 = [datetime.date.today() - datetime.timedelta(days=i) for i in range(6, -1, -1)]
-        x = [d.strftime("%b %d") for d in last7]
-        y = [counts.get(d, 0) for d in last7]
-        self.db_ax.bar(x, y, color="#FFB300")
-        self.db_ax.set_title("Pomodoros (last 7 days)", color="white")
-        self.db_ax.tick_params(axis='x', rotation=45, colors="white")
-        self.db_ax.tick_params(axis='y', colors="white")
-        self.db_fig.tight_layout()
-        self.db_canvas.draw()
+    def _on_refresh_tick(self):
+        # only the dashboard (0) and analytics (3) pages show live stats
+        if self.pages.currentIndex() in (0, 3):
+            self.update_overview()
 
-        # Refresh analytics widget
-        self.analytics_widget.update_stats()
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start()
+        self.update_dashboard_chart()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.refresh_timer.stop()
+            elif self.isVisible() and not self.refresh_timer.isActive():
+                self.refresh_timer.start()
+                self._on_refresh_tick()
+
+    def _on_page_changed(self, index):
+        # the timer skips other pages, so bring stats up to date on arrival
+        if index in (0, 3):
+            self.update_overview()
+
+    def update_dashboard_chart(self):
+        # Dashboard chart: pomodoros last 7 days. Only redrawn while the
+        # dashboard is on screen and when the pomodoro data has changed
+        if not self.dashboard_tab.isVisible():
+            return
+        stats = self.stats
+        stats.refresh()
+        if stats.key == self._db_chart_key:
+            return
+        self._db_chart_key = stats.key
+
+        # the last 7 of the shared 14 days
+        days = stats.days[-7:]
+        y = stats.pomo_by_day[-7:]
+        if days[0] != self._db_labels_from:
+            self._db_labels_from = days[0]
+            self.db_ax.set_xticklabels([d.strftime("%b %d") for d in days])
+            self.db_fig.tight_layout()
+        for rect, h in zip(self.db_bars, y):
+            rect.set_height(h)
+        self.db_ax.relim()
+        self.db_ax.autoscale_view()
+        self.db_canvas.draw_idle()
 
 
 # ------------------------
@@ -989,6 +1469,7 @@ class MainWindow(QMainWindow):
 # ------------------------
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setStyleSheet(APP_QSS)
     win = MainWindow()
     win.show()
     sys.exit(app.exec_())
\ No newline at end of file